@@ -8,8 +8,15 @@ This file demonstrates different types of serializers in Django REST Framework:
 - Custom Validation
 """
 
+import copy
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Exists, OuterRef, Q, QuerySet, Value
+from django.db.models.manager import BaseManager
+from django.db.models.functions import Concat, Trim
 
 
 # ==================== Example 1: Basic Serializer ====================
@@ -27,16 +34,36 @@ class UserBasicSerializer(serializers.Serializer):
     
     def update(self, instance, validated_data):
         """Update and return an existing User instance"""
-        instance.username = validated_data.get('username', instance.username)
-        instance.email = validated_data.get('email', instance.email)
-        instance.first_name = validated_data.get('first_name', instance.first_name)
-        instance.last_name = validated_data.get('last_name', instance.last_name)
-        instance.save()
+        # Only write the columns that were actually sent
+        update_fields = [
+            field for field in ('username', 'email', 'first_name', 'last_name')
+            if field in validated_data
+        ]
+        for field in update_fields:
+            setattr(instance, field, validated_data[field])
+        if update_fields:
+            instance.save(update_fields=update_fields)
         return instance
 
 
 # ==================== Example 2: ModelSerializer ====================
-class UserModelSerializer(serializers.ModelSerializer):
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that introspects the model only once per class.
+    The generated fields are cached on the class and deep-copied for each
+    instance, the same way DRF copies declared fields.
+    """
+    def get_fields(self):
+        cls = type(self)
+        # Look in cls.__dict__ so subclasses never share a parent's cache
+        fields = cls.__dict__.get('_fields_cache')
+        if fields is None:
+            fields = super().get_fields()
+            cls._fields_cache = fields
+        return copy.deepcopy(fields)
+
+
+class UserModelSerializer(CachedFieldsModelSerializer):
     """ModelSerializer automatically creates fields based on the model"""
     class Meta:
         model = User
@@ -55,23 +82,31 @@ class UserSerializerWithValidation(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'password', 'password_confirm']
         read_only_fields = ['id']
+        # Drop the auto-generated UniqueValidator for username (its own query);
+        # uniqueness is checked together with email in validate()
+        extra_kwargs = {'username': {'validators': [UnicodeUsernameValidator()]}}
     
     def validate_username(self, value):
         """Field-level validation for username"""
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError("Username already exists")
         if len(value) < 4:
             raise serializers.ValidationError("Username must be at least 4 characters")
         return value
     
-    def validate_email(self, value):
-        """Field-level validation for email"""
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Email already registered")
-        return value
-    
     def validate(self, data):
         """Object-level validation"""
+        # Check username and email uniqueness in a single query
+        username = data.get('username')
+        email = data.get('email')
+        existing = (
+            User.objects.filter(Q(username=username) | Q(email=email))
+            .values_list('username', 'email')
+            .first()
+        )
+        if existing:
+            if existing[0] == username:
+                raise serializers.ValidationError({'username': "Username already exists"})
+            raise serializers.ValidationError({'email': "Email already registered"})
+        
         if data['password'] != data['password_confirm']:
             raise serializers.ValidationError("Passwords do not match")
         return data
@@ -102,24 +137,61 @@ class UserWithProfileSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'email', 'profile']
 
 
-# ==================== Example 5: SerializerMethodField ====================
+# ==================== Example 5: Computed Fields ====================
+def annotate_user_details(queryset):
+    """Compute full_name and is_premium in SQL for UserDetailSerializer"""
+    premium_groups = User.groups.through.objects.filter(
+        user=OuterRef('pk'), group__name='Premium'
+    )
+    return queryset.annotate(
+        full_name=Trim(Concat('first_name', Value(' '), 'last_name')),
+        is_premium=Exists(premium_groups),
+    )
+
+
+class UserDetailListSerializer(serializers.ListSerializer):
+    """Annotates a whole queryset once, so many=True never queries per row"""
+    def to_representation(self, data):
+        if isinstance(data, BaseManager):
+            data = data.all()
+        if (
+            isinstance(data, QuerySet)
+            and data.query.can_filter()
+            and 'is_premium' not in data.query.annotations
+        ):
+            data = annotate_user_details(data)
+        return super().to_representation(data)
+
+
 class UserDetailSerializer(serializers.ModelSerializer):
-    """Serializer with computed fields"""
-    full_name = serializers.SerializerMethodField()
-    is_premium = serializers.SerializerMethodField()
+    """
+    Serializer with computed fields.
+    Querysets are annotated with annotate_user_details(), so listing users
+    needs no per-row method calls or group queries. A single unannotated
+    User gets full_name in Python and one query for is_premium.
+    """
+    full_name = serializers.CharField(read_only=True)
+    is_premium = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'full_name', 'is_premium']
+        list_serializer_class = UserDetailListSerializer
     
-    def get_full_name(self, obj):
-        """Returns the full name of the user"""
-        return f"{obj.first_name} {obj.last_name}".strip()
-    
-    def get_is_premium(self, obj):
-        """Custom logic to check if user is premium"""
-        # This is just an example - implement your own logic
-        return obj.groups.filter(name='Premium').exists()
+    def to_representation(self, instance):
+        # Read-only fields are skipped when the attribute is missing
+        ret = super().to_representation(instance)
+        if 'full_name' not in ret or 'is_premium' not in ret:
+            if isinstance(self.parent, serializers.ListSerializer):
+                raise ImproperlyConfigured(
+                    'UserDetailSerializer(many=True) needs an unsliced queryset '
+                    'or instances from annotate_user_details().'
+                )
+            if 'full_name' not in ret:
+                ret['full_name'] = f"{instance.first_name} {instance.last_name}".strip()
+            if 'is_premium' not in ret:
+                ret['is_premium'] = instance.groups.filter(name='Premium').exists()
+        return ret
 
 
 # ==================== Usage Example ====================
@@ -145,4 +217,7 @@ user = User.objects.get(id=1)
 serializer = UserModelSerializer(user, data={'email': 'newemail@example.com'}, partial=True)
 if serializer.is_valid():
     serializer.save()
+
+# Computed fields (the list serializer annotates the queryset once)
+serializer = UserDetailSerializer(User.objects.all(), many=True)
 """
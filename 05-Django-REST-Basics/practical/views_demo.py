@@ -8,16 +8,27 @@ This file demonstrates different types of views in Django REST Framework:
 - ViewSets (ModelViewSet, ReadOnlyModelViewSet)
 """
 
+import json
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import Http404, StreamingHttpResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import api_view, action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.generics import (
     ListCreateAPIView, 
-    RetrieveUpdateDestroyAPIView
+    RetrieveUpdateDestroyAPIView,
+    get_object_or_404
 )
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth.models import User
+from django.db.models import Value
+from django.db.models.functions import Concat, Trim
 from rest_framework import serializers
 
 
@@ -28,6 +39,16 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'email', 'first_name', 'last_name']
 
 
+def stream_json_array(rows):
+    """Yield rows as a JSON array one item at a time"""
+    yield '['
+    for index, row in enumerate(rows):
+        if index:
+            yield ','
+        yield json.dumps(row, cls=DjangoJSONEncoder)
+    yield ']'
+
+
 # ==================== Example 1: Function-Based View ====================
 @api_view(['GET', 'POST'])
 def user_list_fbv(request):
@@ -159,6 +180,18 @@ class UserListCreateView(ListCreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [AllowAny]
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List users as plain dicts from .values().
+        Reads need no validation, so rows skip the serializer entirely;
+        create() still goes through UserSerializer.
+        """
+        users = self.filter_queryset(self.get_queryset()).values(*UserSerializer.Meta.fields)
+        page = self.paginate_queryset(users)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(users))
 
 
 class UserRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
@@ -181,21 +214,40 @@ class UserViewSet(viewsets.ModelViewSet):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
     
+    def get_queryset(self):
+        """
+        Load only the columns each custom action actually returns.
+        Default actions keep the full queryset.
+        """
+        if self.action == 'profile':
+            # Plain dicts with full_name computed by the database
+            return User.objects.annotate(
+                full_name=Trim(Concat('first_name', Value(' '), 'last_name'))
+            ).values(
+                'id', 'username', 'email', 'full_name', 'is_staff', 'date_joined'
+            )
+        if self.action == 'active':
+            # Backed by a partial index on auth_user, e.g. a migration with:
+            # migrations.RunSQL(
+            #     "CREATE INDEX CONCURRENTLY users_active_partial "
+            #     "ON auth_user (id) WHERE is_active = true",
+            #     "DROP INDEX CONCURRENTLY users_active_partial",
+            # )
+            # (CONCURRENTLY requires atomic = False on the migration)
+            return User.objects.filter(is_active=True).values(*UserSerializer.Meta.fields)
+        return super().get_queryset()
+    
     @action(detail=True, methods=['get'])
     def profile(self, request, pk=None):
         """
         Custom action to get user profile.
         Accessible at: /users/{id}/profile/
         """
-        user = self.get_object()
-        return Response({
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'full_name': f"{user.first_name} {user.last_name}".strip(),
-            'is_staff': user.is_staff,
-            'date_joined': user.date_joined
-        })
+        # One projected row, no model instance or serializer needed.
+        # get_object_or_404 also turns a malformed pk into a 404.
+        user = get_object_or_404(self.filter_queryset(self.get_queryset()), pk=pk)
+        self.check_object_permissions(request, SimpleNamespace(pk=user['id'], **user))
+        return Response(user)
     
     @action(detail=False, methods=['get'])
     def active(self, request):
@@ -203,9 +255,12 @@ class UserViewSet(viewsets.ModelViewSet):
         Custom action to get only active users.
         Accessible at: /users/active/
         """
-        active_users = User.objects.filter(is_active=True)
-        serializer = self.get_serializer(active_users, many=True)
-        return Response(serializer.data)
+        # Stream rows in chunks so memory stays flat however many users match
+        active_users = self.get_queryset().iterator(chunk_size=500)
+        return StreamingHttpResponse(
+            stream_json_array(active_users),
+            content_type='application/json'
+        )
 
 
 class UserReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
@@ -216,6 +271,37 @@ class UserReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [AllowAny]
+    cache_timeout = 60  # seconds
+    
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve repeated lookups of the same user from the cache.
+        Entries are dropped whenever that user is saved or deleted.
+        """
+        # Key on the resolved integer pk so /users/01/ and /users/1/ share
+        # one entry, the one invalidate_user_cache() deletes
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            pk = int(kwargs[lookup_url_kwarg])
+        except (TypeError, ValueError):
+            raise Http404
+        key = user_cache_key(pk)
+        data = cache.get(key)
+        if data is None:
+            response = super().retrieve(request, *args, **kwargs)
+            cache.set(key, dict(response.data), self.cache_timeout)
+            return response
+        return Response(data)
+
+
+def user_cache_key(pk):
+    return f'user_ro:{pk}'
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Drop the cached read-only representation of a changed user"""
+    cache.delete(user_cache_key(instance.pk))
 
 
 # ==================== URL Configuration Examples ====================
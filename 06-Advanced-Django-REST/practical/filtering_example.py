@@ -1,6 +1,8 @@
 # Filtering and Searching Example - Advanced Django REST Framework
 
 from rest_framework import filters, viewsets
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Q
 from django_filters import rest_framework as django_filters
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Book, Author
@@ -9,7 +11,8 @@ from .serializers import BookSerializer, AuthorSerializer
 # 1. Basic Filtering with DjangoFilterBackend
 
 class BookViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
+    # select_related avoids an extra author query per serialized book
+    queryset = Book.objects.select_related('author')
     serializer_class = BookSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['category', 'author', 'published_year']
@@ -33,7 +36,7 @@ class BookFilter(django_filters.FilterSet):
         fields = ['title', 'category', 'author']
 
 class BookFilterViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
+    queryset = Book.objects.select_related('author')
     serializer_class = BookSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_class = BookFilter
@@ -43,22 +46,55 @@ class BookFilterViewSet(viewsets.ModelViewSet):
     # GET /books/?min_price=10&max_price=50
     # GET /books/?published_after=2020-01-01
 
-# 3. SearchFilter - Full-text search
+# 3. Full-text search with PostgreSQL
+
+# filters.SearchFilter turns ?search= into ILIKE '%term%' on every field,
+# which can't use an index. On PostgreSQL, store a search vector on the
+# model and index it instead:
+#
+# from django.contrib.postgres.indexes import GinIndex
+# from django.contrib.postgres.search import SearchVector, SearchVectorField
+#
+# class Book(models.Model):
+#     ...
+#     search_vector = SearchVectorField(null=True, editable=False)
+#
+#     class Meta:
+#         indexes = [GinIndex(fields=['search_vector'])]
+#
+# Keep it up to date after writes (or with a database trigger):
+# Book.objects.update(search_vector=SearchVector('title', 'description'))
+#
+# BookSearchViewSet requires this field and its migration: without them,
+# ?search= raises a FieldError rather than falling back to SearchFilter.
 
 class BookSearchViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
+    queryset = Book.objects.select_related('author')
     serializer_class = BookSerializer
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title', 'description', 'author__name']
+    # Searching happens in get_queryset(); keep DEFAULT_FILTER_BACKENDS
+    # (e.g. a global OrderingFilter) from overriding the rank ordering
+    filter_backends = []
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        term = self.request.query_params.get('search')
+        if term:
+            query = SearchQuery(term)
+            queryset = (
+                queryset.filter(search_vector=query)
+                .annotate(rank=SearchRank('search_vector', query))
+                .order_by('-rank')
+            )
+        return queryset
     
     # Usage:
     # GET /books/?search=python
-    # Searches in title, description, and author name
+    # Searches in title and description, best matches first
 
 # 4. OrderingFilter - Sort results
 
 class BookOrderingViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
+    queryset = Book.objects.select_related('author')
     serializer_class = BookSerializer
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['title', 'price', 'published_date', 'rating']
@@ -72,7 +108,7 @@ class BookOrderingViewSet(viewsets.ModelViewSet):
 # 5. Combined Filtering, Searching, and Ordering
 
 class CompleteBookViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
+    queryset = Book.objects.select_related('author')
     serializer_class = BookSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'author']
@@ -89,34 +125,36 @@ class CustomFilterViewSet(viewsets.ModelViewSet):
     serializer_class = BookSerializer
     
     def get_queryset(self):
-        queryset = Book.objects.all()
+        # Collect conditions in one Q object and filter once, instead of
+        # cloning the queryset for every parameter
+        conditions = Q()
         
         # Filter by query parameters
         category = self.request.query_params.get('category')
         if category:
-            queryset = queryset.filter(category=category)
+            conditions &= Q(category=category)
         
         # Filter by user
         user = self.request.query_params.get('user')
         if user:
-            queryset = queryset.filter(owner__username=user)
+            conditions &= Q(owner__username=user)
         
         # Filter by price range
         min_price = self.request.query_params.get('min_price')
         if min_price:
-            queryset = queryset.filter(price__gte=min_price)
+            conditions &= Q(price__gte=min_price)
         
         # Filter by date range
         start_date = self.request.query_params.get('start_date')
         if start_date:
-            queryset = queryset.filter(published_date__gte=start_date)
+            conditions &= Q(published_date__gte=start_date)
         
-        return queryset
+        return Book.objects.select_related('author').filter(conditions)
 
 # 7. Boolean Filtering
 
 class BooleanFilterViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
+    queryset = Book.objects.select_related('author')
     serializer_class = BookSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['is_published', 'is_featured', 'is_bestseller']
@@ -143,6 +181,7 @@ class CustomMethodFilter(django_filters.FilterSet):
     popular = django_filters.BooleanFilter(method='filter_popular')
     
     def filter_popular(self, queryset, name, value):
+        # Thresholds are applied in SQL; never fetch rows and score them in Python
         if value:
             return queryset.filter(rating__gte=4.0, sales__gte=1000)
         return queryset
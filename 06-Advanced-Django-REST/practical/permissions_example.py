@@ -1,8 +1,17 @@
 # Permissions Example - Advanced Django REST Framework
 
-from rest_framework import permissions
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions, permissions
+from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+# SAFE_METHODS is a tuple; a frozenset makes the per-object check a hash lookup
+_SAFE = frozenset(SAFE_METHODS)
+
 # 1. Built-in Permission Classes
 
 # AllowAny - Allow unrestricted access
@@ -39,25 +48,27 @@ class IsOwnerOrReadOnly(BasePermission):
     
     def has_object_permission(self, request, view, obj):
         # Read permissions for any request (GET, HEAD, OPTIONS)
-        if request.method in SAFE_METHODS:
+        if request.method in _SAFE:
             return True
         
-        # Write permissions only for owner
-        return obj.owner == request.user
+        # Write permissions only for owner. Compare the raw FK id so
+        # obj.owner is never fetched; anonymous users have id None, which
+        # would otherwise match objects without an owner.
+        return request.user.is_authenticated and obj.owner_id == request.user.id
 
 class IsOwner(BasePermission):
     """
     Custom permission: only owner can access
     """
     def has_object_permission(self, request, view, obj):
-        return obj.owner == request.user
+        return request.user.is_authenticated and obj.owner_id == request.user.id
 
 class IsSuperuserOrReadOnly(BasePermission):
     """
     Superuser can do everything, others read-only
     """
     def has_permission(self, request, view):
-        if request.method in SAFE_METHODS:
+        if request.method in _SAFE:
             return True
         return request.user and request.user.is_superuser
 
@@ -68,9 +79,9 @@ class IsAuthorOrReadOnly(BasePermission):
     Check permissions at object level
     """
     def has_object_permission(self, request, view, obj):
-        if request.method in SAFE_METHODS:
+        if request.method in _SAFE:
             return True
-        return obj.author == request.user
+        return request.user.is_authenticated and obj.author_id == request.user.id
 
 # 4. Multiple Permissions (AND logic)
 
@@ -86,12 +97,33 @@ class HasAPIKey(BasePermission):
     """
     def has_permission(self, request, view):
         api_key = request.query_params.get('api_key')
-        return api_key == 'your-secret-key'
+        # Read from settings (e.g. API_KEY = os.environ['API_KEY']) rather than source;
+        # deny access if it isn't configured
+        expected_key = getattr(settings, 'API_KEY', None)
+        if not api_key or not expected_key:
+            return False
+        # Constant-time compare so response timing doesn't leak the key
+        return hmac.compare_digest(_api_key_digest(api_key), _api_key_digest(expected_key))
+
+def _api_key_digest(key):
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
 
 # 6. Dynamic Permissions Based on Action
 
 class DynamicPermissionViewSet(viewsets.ModelViewSet):
+    # Permission classes hold no state, so instances are built once per
+    # (viewset class, action) and shared across requests
+    _permission_cache = {}
+    
     def get_permissions(self):
+        key = (type(self), self.action)
+        permissions = self._permission_cache.get(key)
+        if permissions is None:
+            permissions = [permission() for permission in self.get_permission_classes()]
+            self._permission_cache[key] = permissions
+        return permissions
+    
+    def get_permission_classes(self):
         """
         Different permissions for different actions
         """
@@ -103,16 +135,28 @@ class DynamicPermissionViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
         else:
             permission_classes = [IsAuthenticated]
-        return [permission() for permission in permission_classes]
+        return permission_classes
 
 # 7. Group-based Permissions
 
+def get_group_names(user):
+    """
+    Return the user's group names, loaded once and cached on the user.
+    request.user lives for the whole request, so every permission check
+    after the first is a set lookup instead of a query.
+    """
+    group_names = getattr(user, '_group_names', None)
+    if group_names is None:
+        group_names = frozenset(user.groups.values_list('name', flat=True))
+        user._group_names = group_names
+    return group_names
+
 class IsInEditorGroup(BasePermission):
     """
     Check if user belongs to 'Editor' group
     """
     def has_permission(self, request, view):
-        return request.user.groups.filter(name='Editor').exists()
+        return 'Editor' in get_group_names(request.user)
 
 # 8. Custom Permission with Error Messages
 
@@ -120,7 +164,30 @@ class IsPremiumUser(BasePermission):
     message = 'You need a premium subscription to access this resource.'
     
     def has_permission(self, request, view):
-        return hasattr(request.user, 'subscription') and request.user.subscription.is_premium
+        # Users without a subscription (and AnonymousUser) fall back to False
+        subscription = getattr(request.user, 'subscription', None)
+        return getattr(subscription, 'is_premium', False)
+
+class SubscriptionTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that loads the user's subscription with the user,
+    so IsPremiumUser doesn't need a second query
+    """
+    def authenticate_credentials(self, key):
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user', 'user__subscription').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        
+        return (token.user, token)
+
+class PremiumContentViewSet(viewsets.ModelViewSet):
+    authentication_classes = [SubscriptionTokenAuthentication]
+    permission_classes = [IsAuthenticated, IsPremiumUser]
 
 # 9. Permission with Multiple Conditions
 
@@ -129,11 +196,11 @@ class CanEditPost(BasePermission):
     User can edit if they are owner OR admin OR moderator
     """
     def has_object_permission(self, request, view, obj):
-        if request.method in SAFE_METHODS:
+        if request.method in _SAFE:
             return True
         
         return (
-            obj.owner == request.user or
+            (request.user.is_authenticated and obj.owner_id == request.user.id) or
             request.user.is_staff or
-            request.user.groups.filter(name='Moderator').exists()
+            'Moderator' in get_group_names(request.user)
         )
@@ -28,6 +28,9 @@ urlpatterns = [
 ]
 
 # 2. SimpleRouter - No API root view
+# DefaultRouter also adds the root view and format-suffix (.json) patterns,
+# so every request has more URL patterns to try. Prefer SimpleRouter when
+# the browsable API root isn't needed.
 simple_router = SimpleRouter()
 simple_router.register(r'books', BookViewSet)
 
@@ -61,7 +64,7 @@ urlpatterns = [
 ]
 
 # 5. Router with Custom Actions
-router = DefaultRouter()
+router = SimpleRouter()
 router.register(r'books', BookViewSet)
 
 # URLs generated for custom actions:
@@ -69,10 +72,10 @@ router.register(r'books', BookViewSet)
 # If @action(detail=False): /books/action_name/
 
 # 6. Multiple Routers
-books_router = DefaultRouter()
+books_router = SimpleRouter()
 books_router.register(r'books', BookViewSet)
 
-users_router = DefaultRouter()
+users_router = SimpleRouter()
 users_router.register(r'users', UserViewSet)
 
 urlpatterns = [
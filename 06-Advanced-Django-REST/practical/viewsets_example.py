@@ -1,7 +1,11 @@
 # ViewSets Example - Advanced Django REST Framework
 
+from types import SimpleNamespace
+
+from django.db.models import Avg, Count
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from .models import Book, Author
 from .serializers import BookSerializer, AuthorSerializer
@@ -17,23 +21,31 @@ class BookViewSet(viewsets.ModelViewSet):
     - partial_update() - PATCH /books/{id}/
     - destroy() - DELETE /books/{id}/
     """
-    queryset = Book.objects.all()
+    # select_related joins the author in the same query, so rendering
+    # book.author doesn't cost one extra query per row
+    queryset = Book.objects.select_related('author')
     serializer_class = BookSerializer
     
     # Custom action - GET /books/{id}/summary/
     @action(detail=True, methods=['get'])
     def summary(self, request, pk=None):
-        book = self.get_object()
+        # Fetch the summary columns plus the author/owner ids that
+        # object-level permissions compare against
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            'pk', 'title', 'pages', 'author__name', 'author_id', 'owner_id'
+        )
+        book = get_object_or_404(queryset, pk=pk)
+        self.check_object_permissions(request, SimpleNamespace(**book))
         return Response({
-            'title': book.title,
-            'author': book.author.name,
-            'pages': book.pages
+            'title': book['title'],
+            'author': book['author__name'],
+            'pages': book['pages']
         })
     
     # Custom list action - GET /books/bestsellers/
     @action(detail=False, methods=['get'])
     def bestsellers(self, request):
-        bestsellers = Book.objects.filter(sales__gte=10000)
+        bestsellers = self.get_queryset().filter(sales__gte=10000)
         serializer = self.get_serializer(bestsellers, many=True)
         return Response(serializer.data)
 
@@ -50,7 +62,7 @@ class AuthorViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True)
     def books(self, request, pk=None):
         author = self.get_object()
-        books = Book.objects.filter(author=author)
+        books = Book.objects.filter(author=author).select_related('author')
         serializer = BookSerializer(books, many=True)
         return Response(serializer.data)
 
@@ -61,15 +73,18 @@ class BookStatisticsViewSet(viewsets.ViewSet):
     """
     
     def list(self, request):
+        # Count and average come from one aggregate query over Book
+        book_stats = Book.objects.aggregate(total=Count('id'), avg_pages=Avg('pages'))
         stats = {
-            'total_books': Book.objects.count(),
+            'total_books': book_stats['total'],
             'total_authors': Author.objects.count(),
-            'avg_pages': Book.objects.aggregate(Avg('pages'))['pages__avg']
+            'avg_pages': book_stats['avg_pages']
         }
         return Response(stats)
     
     def retrieve(self, request, pk=None):
-        book = Book.objects.get(pk=pk)
+        # only() loads just the columns used below
+        book = Book.objects.only('title', 'view_count', 'average_rating').get(pk=pk)
         stats = {
             'title': book.title,
             'views': book.view_count,